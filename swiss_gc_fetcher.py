@@ -7,7 +7,7 @@ Devices:
   - picoloader: extract GEKKOBOOT to provide ipl.dol + swiss/, then refresh Apploader; supports --cubiboot.
   - gcloader: install boot.iso from GCLoader zip + Apploader; ignores --cubeboot/--cubiboot.
 
-Always refreshes Apploader: removes /swiss/patches/apploader.img then merges the new payload (overwrite).
+Always refreshes Apploader: merges the new payload, atomically replacing /swiss/patches/apploader.img.
 Hide step supports: *.dol, *.ini, *.cli, GBI, MCBACKUP, swiss.
 
 Notes:
@@ -17,135 +17,713 @@ Notes:
 """
 
 import argparse
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-import os, sys, shutil, json, zipfile, tarfile, urllib.request, urllib.error, tempfile, subprocess, warnings
+import os, sys, io, shutil, json, urllib.request, urllib.error, urllib.parse, http.client, tempfile, hashlib, stat, time, functools, threading, contextlib, heapq
 import re as _re
-
-# Suppress non-critical noise (user requested)
-warnings.filterwarnings("ignore", category=DeprecationWarning)
+# tarfile, zipfile and subprocess are imported where used so --help/--dry-run skip loading them
 
 GITHUB_API = "https://api.github.com"
 SWISS_REPO = "emukidid/swiss-gc"
 CUBEBOOT_REPO = "OffBroadway/cubeboot"
 CUBIBOOT_REPO = "makeo/cubiboot"
+RE_TAG_REV = _re.compile(r'r(\d+)')
+RE_DIR_REV = _re.compile(r'swiss_r(\d+)', _re.IGNORECASE)
+RE_DOL_NAME = _re.compile(r'swiss_r\d+\.dol')
+# Copy chunk for SD writes: large enough to cover whole FAT clusters / SD record units per write()
+SD_BUFSIZE = 1 << 20
+# --verbose download progress interval
+DOWNLOAD_PROGRESS_STEP = 16 << 20
+# Read size for streamed ("r|") tar archives; tarfile's default is a single 10 KiB record
+TAR_STREAM_BUFSIZE = 1 << 18
+CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "swiss-gc-fetcher"
 
 def log(msg: str):
     print(msg, flush=True)
 
-def http_get_json(url: str):
-    req = urllib.request.Request(url, headers={"Accept":"application/vnd.github+json","User-Agent":"swiss-gc-fetcher"})
-    with urllib.request.urlopen(req) as r:
-        return json.loads(r.read().decode("utf-8"))
+# Retries for transient failures (connection errors, 429/5xx): HTTP_BACKOFF * 2**attempt seconds apart
+HTTP_RETRIES = 3
+HTTP_BACKOFF = 0.3
+HTTP_RETRY_STATUSES = frozenset((429, 500, 502, 503, 504))
+
+# Keep-alive connections, one per (scheme, host) and per thread (http.client connections are not thread-safe)
+_http_local = threading.local()
+
+def http_open(url: str, headers: dict|None=None, max_redirects: int=5):
+    hdrs = {"User-Agent":"swiss-gc-fetcher"}
+    hdrs.update(headers or {})
+    for _ in range(max_redirects + 1):
+        u = urllib.parse.urlsplit(url)
+        if urllib.request.getproxies().get(u.scheme) and not urllib.request.proxy_bypass(u.hostname or ""):
+            # http.client knows nothing about proxies; let urllib handle those setups
+            return urllib.request.urlopen(urllib.request.Request(url, headers=hdrs))
+        conns = _http_local.__dict__.setdefault("conns", {})
+        conn = conns.get((u.scheme, u.netloc))
+        if conn is None:
+            cls = http.client.HTTPSConnection if u.scheme == "https" else http.client.HTTPConnection
+            conn = conns[(u.scheme, u.netloc)] = cls(u.netloc)
+        target = (u.path or "/") + (f"?{u.query}" if u.query else "")
+        for attempt in range(HTTP_RETRIES + 1):
+            # Connection errors (including an idle keep-alive connection dropped by the server) and
+            # transient server statuses are retried on a fresh connection with exponential backoff;
+            # the first retry of a connection error is immediate since a stale socket is the usual cause
+            try:
+                conn.request("GET", target, headers=hdrs)
+                resp = conn.getresponse()
+            except (http.client.HTTPException, OSError):
+                conn.close()
+                if attempt == HTTP_RETRIES:
+                    raise
+                if attempt:
+                    time.sleep(HTTP_BACKOFF * 2 ** attempt)
+                continue
+            if resp.status not in HTTP_RETRY_STATUSES or attempt == HTTP_RETRIES:
+                break
+            resp.read()
+            time.sleep(HTTP_BACKOFF * 2 ** attempt)
+        if resp.status in (301, 302, 303, 307, 308) and resp.getheader("Location"):
+            resp.read()
+            url = urllib.parse.urljoin(url, resp.getheader("Location"))
+            continue
+        if resp.status >= 300:
+            body = resp.read()
+            raise urllib.error.HTTPError(url, resp.status, resp.reason, resp.headers, io.BytesIO(body))
+        return resp
+    raise urllib.error.URLError(f"too many redirects fetching {url}")
+
+@functools.lru_cache(maxsize=None)
+def json_loads():
+    # Optional orjson (C parser, noticeably faster on the larger release lists); stdlib json otherwise
+    try:
+        import orjson
+        return orjson.loads
+    except ImportError:
+        return json.loads
+
+def http_get_json(url: str, headers: dict|None=None):
+    # Release JSON compresses well; downloads keep http.client's implicit "Accept-Encoding: identity"
+    # so an already-compressed .tar.xz is never wrapped again
+    hdrs = {"Accept":"application/vnd.github+json", "Accept-Encoding":"gzip"}
+    hdrs.update(headers or {})
+    with http_open(url, hdrs) as r:
+        body = r.read()
+        if (r.headers.get("Content-Encoding") or "").lower() == "gzip":
+            import gzip
+            body = gzip.decompress(body)
+        # Parsed straight from bytes; both parsers detect the UTF-8 encoding themselves
+        return json_loads()(body), r.headers
+
+@functools.lru_cache(maxsize=None)
+def api_cache_dir() -> Path:
+    # XDG cache when writable (HOME may be read-only, e.g. under sudo or in a container), else a
+    # private per-user dir in the temp dir; None (no caching) if neither is usable
+    d = CACHE_DIR / "api"
+    try:
+        d.mkdir(parents=True, exist_ok=True)
+        if os.access(d, os.W_OK):
+            return d
+    except OSError:
+        pass
+    if not hasattr(os, "getuid"):
+        return None
+    # The temp dir is shared and world-writable: a cache planted there by another user would
+    # pick the release we download, so only trust a 0700 dir that we own
+    base = Path(tempfile.gettempdir()) / f"swiss-gc-fetcher-{os.getuid()}"
+    try:
+        base.mkdir(mode=0o700, exist_ok=True)
+        st = os.lstat(base)
+        if not stat.S_ISDIR(st.st_mode) or st.st_uid != os.getuid() or st.st_mode & 0o077:
+            return None
+        d = base / "api"
+        d.mkdir(mode=0o700, exist_ok=True)
+        return d
+    except OSError:
+        return None
+
+def cached_get_json(url: str, ttl: int=3600):
+    # On-disk cache keyed by URL: entries younger than ttl are used as-is, older ones
+    # are revalidated with If-None-Match/If-Modified-Since so an unchanged release costs a 304.
+    cache_dir = api_cache_dir()
+    path = cache_dir / (hashlib.sha1(url.encode("utf-8")).hexdigest() + ".json") if cache_dir else None
+    try:
+        entry = json_loads()(path.read_bytes()) if path else None
+    except (OSError, ValueError):
+        entry = None
+    # A fetch time in the future (planted entry, clock stepped back) is not fresh: revalidate
+    if entry and 0 <= time.time() - entry.get("fetched", 0) < ttl:
+        return entry["body"]
+    cond = {}
+    if entry and entry.get("etag"):
+        cond["If-None-Match"] = entry["etag"]
+    if entry and entry.get("last_modified"):
+        cond["If-Modified-Since"] = entry["last_modified"]
+    try:
+        body, headers = http_get_json(url, cond)
+        entry = {"etag": headers.get("ETag"), "last_modified": headers.get("Last-Modified"), "body": body}
+    except urllib.error.HTTPError as e:
+        if e.code != 304 or not entry:
+            raise
+    entry["fetched"] = time.time()
+    if not path:
+        return entry["body"]
+    try:
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(entry), encoding="utf-8")
+        os.replace(tmp_path, path)
+    except OSError:
+        # Non-critical: a read-only or missing cache dir just means no caching
+        pass
+    return entry["body"]
 
-def download(url: str, dest: Path):
+def download(url: str, dest: Path, progress: bool=False):
+    # Raw fd + one reused 1 MiB buffer (readinto/os.write, no per-chunk bytes objects); the size from
+    # Content-Length is reserved up front, and progress logs every DOWNLOAD_PROGRESS_STEP bytes
     dest = Path(dest)
     dest.parent.mkdir(parents=True, exist_ok=True)
-    req = urllib.request.Request(url, headers={"User-Agent":"swiss-gc-fetcher"})
-    with urllib.request.urlopen(req) as r, open(dest, "wb") as f:
-        shutil.copyfileobj(r, f)
+    with http_open(url) as r:
+        total = int(r.headers.get("Content-Length") or 0)
+        fd = os.open(dest, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0), 0o666)
+        try:
+            if hasattr(os, "posix_fadvise"):
+                # The file is written once front to back and read back the same way by the extractor
+                try:
+                    os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+                except OSError:
+                    pass
+            preallocate(fd, total)
+            buf = memoryview(bytearray(SD_BUFSIZE))
+            done, next_report = 0, DOWNLOAD_PROGRESS_STEP
+            while True:
+                n = r.readinto(buf)
+                if not n:
+                    break
+                chunk = buf[:n]
+                while chunk:
+                    chunk = chunk[os.write(fd, chunk):]
+                done += n
+                if progress and done >= next_report:
+                    log(f"  {dest.name}: {done >> 20} MiB" + (f" of {total >> 20} MiB" if total else ""))
+                    next_report += DOWNLOAD_PROGRESS_STEP
+            # readinto() just returns 0 when the server closes early; a short file must not reach the card
+            if total and done != total:
+                raise OSError(f"download of {url} ended early: got {done} of {total} bytes")
+        finally:
+            os.close(fd)
     return dest
 
+@functools.lru_cache(maxsize=None)
+def _fallocate():
+    if not sys.platform.startswith("linux"):
+        return None
+    import ctypes
+    try:
+        fn = ctypes.CDLL(None, use_errno=True).fallocate64
+    except (OSError, AttributeError):
+        return None
+    fn.argtypes = [ctypes.c_int, ctypes.c_int, ctypes.c_int64, ctypes.c_int64]
+    return fn
+
+def preallocate(fd: int, size: int):
+    # Reserve the clusters for a file about to be written in one allocation, so FAT can hand out a
+    # contiguous chain. This is fallocate(2) with FALLOC_FL_KEEP_SIZE rather than os.posix_fallocate:
+    # on vfat a size-changing fallocate is an expanding truncate that zero-fills the file first, and
+    # glibc emulates posix_fallocate with writes where the filesystem lacks support -- both double the writes.
+    fn = _fallocate()
+    if fn is not None and size > 0:
+        fn(fd, 1, 0, size)  # FALLOC_FL_KEEP_SIZE; failure is harmless, the write just allocates as it goes
+
+def settle(f):
+    # Called on every SD destination before it is closed: the fsync makes an atomic replace durable
+    # before the rename, and the now-clean pages (never read back) are dropped from the page cache
+    f.flush()
+    os.fsync(f.fileno())
+    if hasattr(os, "posix_fadvise"):
+        try:
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+        except OSError:
+            pass
+
+def copy_file(src, dst: Path):
+    # shutil.copy2 equivalent: in-kernel copy_file_range where the kernel allows it (Linux; usually same fs),
+    # then sendfile (still in-kernel across filesystems, e.g. tmpfs -> vfat), otherwise an SD-sized buffer
+    # on both the copy loop and the destination
+    if isinstance(src, io.BytesIO):
+        # In-memory payload from extract_tar_members: a single preallocated write, mtime from the archive
+        with src.getbuffer() as data, open(dst, "wb") as d:
+            preallocate(d.fileno(), len(data))
+            d.write(data)
+            settle(d)
+        mtime = getattr(src, "mtime", None)
+        if mtime is not None:
+            os.utime(dst, (mtime, mtime))
+        return
+    with open(src, "rb") as s, open(dst, "wb", buffering=SD_BUFSIZE) as d:
+        remaining = os.fstat(s.fileno()).st_size
+        preallocate(d.fileno(), remaining)
+        if hasattr(os, "copy_file_range"):
+            try:
+                while remaining > 0:
+                    n = os.copy_file_range(s.fileno(), d.fileno(), remaining)
+                    if n == 0:
+                        break
+                    remaining -= n
+            except OSError:
+                # EXDEV/ENOSYS/EINVAL etc.: both file offsets sit after the copied part, so just continue below
+                pass
+        if remaining > 0 and hasattr(os, "sendfile"):
+            try:
+                while remaining > 0:
+                    # offset None: advances the source position, so a fallback below resumes where this stopped
+                    n = os.sendfile(d.fileno(), s.fileno(), None, remaining)
+                    if n == 0:
+                        break
+                    remaining -= n
+            except OSError:
+                pass
+        if remaining > 0:
+            shutil.copyfileobj(s, d, SD_BUFSIZE)
+        settle(d)
+    shutil.copystat(src, dst)
+
+def install_file(src, dst: Path, owned: bool=False):
+    # owned: src is a run-private temp file read by nothing else; when it already sits on the
+    # destination filesystem, a rename replaces the full data copy
+    if owned and isinstance(src, Path):
+        try:
+            if os.stat(src).st_dev == os.stat(dst.parent).st_dev:
+                os.replace(src, dst)
+                return
+        except OSError:
+            pass
+    copy_file(src, dst)
+
 def choose_release_asset(tag: str|None, previous: bool):
     if tag:
-        rel = http_get_json(f"{GITHUB_API}/repos/{SWISS_REPO}/releases/tags/{tag}")
+        rel = cached_get_json(f"{GITHUB_API}/repos/{SWISS_REPO}/releases/tags/{tag}")
+    elif previous:
+        # Only the previous release needs the full list; /latest cannot answer that
+        # Newest first: a short page still leaves room for a few prereleases ahead of the two we need
+        rels = cached_get_json(f"{GITHUB_API}/repos/{SWISS_REPO}/releases?per_page=10")
+        # Only the two newest official releases matter: no full sort
+        rels = heapq.nlargest(2, (r for r in rels if not r.get("draft") and not r.get("prerelease")),
+                              key=lambda r: r.get("created_at",""))
+        rel = rels[1] if len(rels) > 1 else rels[0]
     else:
-        rels = http_get_json(f"{GITHUB_API}/repos/{SWISS_REPO}/releases")
-        rels = [r for r in rels if not r.get("draft") and not r.get("prerelease")]
-        rels.sort(key=lambda r: r.get("created_at",""), reverse=True)
-        rel = rels[1] if previous and len(rels) > 1 else rels[0]
-    assets = rel.get("assets") or []
-    tarxz = next((a for a in assets if str(a.get("name","")).endswith(".tar.xz")), None)
-    sevenz = next((a for a in assets if str(a.get("name","")).endswith(".7z")), None)
-    chosen = tarxz or sevenz
+        # /releases/latest already excludes drafts and prereleases
+        rel = cached_get_json(f"{GITHUB_API}/repos/{SWISS_REPO}/releases/latest")
+    # One pass: the first .tar.xz wins outright, else the first .7z
+    chosen = None
+    for a in rel.get("assets") or []:
+        name = str(a.get("name",""))
+        if name.endswith(".tar.xz"):
+            chosen = a
+            break
+        if chosen is None and name.endswith(".7z"):
+            chosen = a
     if not chosen:
         raise RuntimeError("No supported Swiss assets (.tar.xz or .7z) found in the selected release.")
     return rel, chosen
 
-def extract_archive(archive_path: Path, dest: Path):
-    dest.mkdir(parents=True, exist_ok=True)
-    name = archive_path.name.lower()
-    if name.endswith(".tar.xz") or name.endswith(".txz") or name.endswith(".tar"):
+def payload_wanted(name: str, device: str) -> bool:
+    # Archive members the install actually reads: the Swiss DOL, the Apploader zip, and the device payload
+    parts = name.replace("\\","/").lower().split("/")
+    if len(parts) >= 2 and parts[-2] == "dol":
+        # Only the plain swiss_r<rev>.dol is installed; the other DOL variants are never read
+        return RE_DOL_NAME.fullmatch(parts[-1]) is not None
+    if parts[-2:] == ["apploader", "extract_to_root.zip"]:
+        return True
+    if device == "gcloader":
+        return parts[-2:] == ["gcloader", "extract_to_root.zip"]
+    if device == "picoloader":
+        if "gekkoboot" not in parts[:-1]:
+            return False
+        return any("pico" in d and "loader" in d for d in parts[:parts.index("gekkoboot")])
+    return False
+
+def extract_tar_members(tf, dest: Path, wanted=None, in_memory: bool=False) -> dict:
+    # Iterate members as the stream is decoded so skipped members are never written out.
+    # in_memory reads the files into named BytesIO objects (carrying the member mtime) instead of dest.
+    # Returns {member name: Path or BytesIO} for every file, so callers need no walk afterwards.
+    kept = {}
+    for member in tf:
+        if wanted is not None and not wanted(member.name):
+            continue
+        if in_memory and member.isfile():
+            with tf.extractfile(member) as f:
+                buf = io.BytesIO(f.read())
+            buf.name, buf.mtime = member.name, member.mtime
+            kept[member.name] = buf
+            continue
         # Use filter="data" when available (Python 3.12+) to silence the 3.14 warning and be safe by default
-        with tarfile.open(archive_path, "r:*") as tf:
+        try:
+            tf.extract(member, dest, filter="data")
+        except TypeError:
+            # Older Python without filter= support
+            tf.extract(member, dest)
+        if member.isfile():
+            kept[member.name] = dest / member.name
+    return kept
+
+@functools.lru_cache(maxsize=None)
+def xz_path() -> str|None:
+    return shutil.which("xz")
+
+def extract_tar_xz(source, dest: Path, wanted=None, in_memory: bool=False) -> dict:
+    # source: an archive Path, or a readable stream (e.g. the HTTP response) decoded as it arrives.
+    # copybufsize lifts tarfile's 16 KiB member copy chunk to SD_BUFSIZE.
+    # Multithreaded xz decodes when available; tarfile still parses the stream so filter="data" and wanted apply.
+    import tarfile, subprocess
+    xz = xz_path()
+    if not xz:
+        if isinstance(source, Path):
+            with tarfile.open(source, "r:xz", copybufsize=SD_BUFSIZE) as tf:
+                return extract_tar_members(tf, dest, wanted, in_memory)
+        else:
+            with tarfile.open(fileobj=source, mode="r|xz", bufsize=TAR_STREAM_BUFSIZE, copybufsize=SD_BUFSIZE) as tf:
+                return extract_tar_members(tf, dest, wanted, in_memory)
+    feed_error = []
+    if isinstance(source, Path):
+        p = subprocess.Popen([xz, "-dc", "-T0", str(source)], stdout=subprocess.PIPE)
+        feeder = None
+    else:
+        p = subprocess.Popen([xz, "-dc", "-T0"], stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+        headers = getattr(source, "headers", None)
+        expected = int(headers.get("Content-Length") or 0) if headers else 0
+        def feed():
             try:
-                tf.extractall(dest, filter="data")
-            except TypeError:
-                # Older Python without filter= support
-                tf.extractall(dest)
-        return
+                fed = 0
+                while True:
+                    chunk = source.read(SD_BUFSIZE)
+                    if not chunk:
+                        break
+                    p.stdin.write(chunk)
+                    fed += len(chunk)
+                # An early close from the server is a quiet EOF, not an exception
+                if expected and fed != expected:
+                    raise http.client.IncompleteRead(b"", expected - fed)
+            except Exception as e:
+                feed_error.append(e)
+            finally:
+                try:
+                    p.stdin.close()
+                except OSError:
+                    pass
+        feeder = threading.Thread(target=feed, daemon=True)
+        feeder.start()
+    try:
+        with tarfile.open(fileobj=p.stdout, mode="r|", bufsize=TAR_STREAM_BUFSIZE, copybufsize=SD_BUFSIZE) as tf:
+            kept = extract_tar_members(tf, dest, wanted, in_memory)
+        # Drain the zero padding after the end-of-archive marker so xz is not cut off by SIGPIPE
+        while p.stdout.read(SD_BUFSIZE):
+            pass
+    except Exception as e:
+        # A failed download truncates xz's input, so tarfile trips over the short stream
+        # first; surface the network error rather than "unexpected end of data"
+        p.stdout.close()
+        if feeder:
+            feeder.join()
+        if feed_error and not isinstance(feed_error[0], BrokenPipeError):
+            raise feed_error[0] from e
+        raise
+    finally:
+        p.stdout.close()
+        if feeder:
+            feeder.join()
+        rc = p.wait()
+    if feed_error and not isinstance(feed_error[0], BrokenPipeError):
+        raise feed_error[0]
+    if rc != 0:
+        raise RuntimeError(f"xz failed to decompress {getattr(source, 'name', 'stream')} (exit {rc})")
+    return kept
+
+def stream_extract_tar_xz(url: str, dest: Path, wanted=None, in_memory: bool=False) -> dict:
+    # Download and extract in one pass: the archive never touches the disk
+    with http_open(url) as r:
+        return extract_tar_xz(r, dest, wanted, in_memory)
+
+def extract_archive(archive_path: Path, dest: Path, wanted=None) -> dict|None:
+    # wanted(member_name) -> bool limits extraction to the members we use; None extracts everything.
+    # Returns the extracted {member name: Path} for tar archives, None when the caller must walk dest.
+    import tarfile
+    dest.mkdir(parents=True, exist_ok=True)
+    name = archive_path.name.lower()
+    if name.endswith(".tar.xz") or name.endswith(".txz"):
+        return extract_tar_xz(archive_path, dest, wanted)
+    if name.endswith(".tar"):
+        with tarfile.open(archive_path, "r:*", copybufsize=SD_BUFSIZE) as tf:
+            return extract_tar_members(tf, dest, wanted)
     if name.endswith(".7z"):
         try:
             import py7zr
         except ImportError:
             raise RuntimeError("This asset is .7z; please 'pip install py7zr' or fetch a .tar.xz release.")
         with py7zr.SevenZipFile(archive_path, mode='r') as z:
-            z.extractall(path=dest)
-        return
+            if wanted is None:
+                z.extractall(path=dest)
+            else:
+                z.extract(path=dest, targets=[n for n in z.getnames() if wanted(n)])
+        return None
     raise RuntimeError(f"Unsupported archive format: {archive_path.name}")
 
-def find_member(root: Path, rel: str) -> Path|None:
-    # First try exact/case-sensitive
-    p = (root / rel)
-    if p.exists():
-        return p
-    # Fallback: case-insensitive suffix match
-    rel_norm = rel.replace("\\","/").lower()
-    for cand in root.rglob("*"):
-        if cand.as_posix().lower().endswith(rel_norm):
-            return cand
+def walk_scandir(root):
+    # Breadth-first os.DirEntry walk: is_dir()/is_file() come from the directory read itself,
+    # so unlike rglob/os.walk there is no extra stat() per entry. Directories precede their contents.
+    # Unreadable directories (e.g. lost+found) are skipped, as rglob does.
+    pending = deque([root])
+    while pending:
+        try:
+            it = os.scandir(pending.popleft())
+        except OSError:
+            continue
+        with it:
+            for e in it:
+                yield e
+                if e.is_dir(follow_symlinks=False):
+                    pending.append(e.path)
+
+def manifest_key(rel: str, dol_name: str) -> str|None:
+    parts = rel.replace("\\", "/").lower().split("/")
+    if len(parts) < 2:
+        return None
+    parent, name = parts[-2], parts[-1]
+    if parent == "dol" and name == dol_name:
+        return "dol"
+    if parent == "apploader" and name == "extract_to_root.zip":
+        return "apploader_zip"
+    if parent == "gcloader" and name == "extract_to_root.zip":
+        return "gcloader_zip"
+    if (parent == "gekkoboot" and name.endswith(".zip") and "extract_to_root" in name
+            and any("pico" in d and "loader" in d for d in parts[:-2])):
+        return "gekkoboot_zip"
     return None
 
-def merge_directories(src: Path, dst: Path, overwrite: bool):
-    for root, dirs, files in os.walk(src):
-        rel = Path(root).relative_to(src)
-        outdir = dst / rel
-        outdir.mkdir(parents=True, exist_ok=True)
-        for fn in files:
-            s = Path(root) / fn
-            d = outdir / fn
+def build_manifest(root: Path, rev: str, members: dict|None=None) -> dict:
+    # Resolves every payload the install reads. members ({member name: Path or BytesIO}, as returned
+    # by extract_tar_members) is classified by name alone; otherwise root is walked once. Either way
+    # the shallowest match wins and entries stay None when absent.
+    manifest = dict.fromkeys(("dol", "apploader_zip", "gcloader_zip", "gekkoboot_zip"))
+    dol_name = f"swiss_r{rev}.dol"
+    if members is None:
+        members = {}
+        if root.exists():
+            # The walk is breadth-first, so shallower entries are inserted first
+            prefix = len(os.path.join(str(root), ""))
+            for e in walk_scandir(root):
+                if not e.is_dir(follow_symlinks=False):
+                    members[e.path[prefix:].replace(os.sep, "/")] = Path(e.path)
+    for name in sorted(members, key=lambda n: n.count("/")):
+        key = manifest_key(name, dol_name)
+        if key and manifest[key] is None:
+            manifest[key] = members[name]
+    return manifest
+
+def payload_label(src) -> str:
+    # Payloads are Paths, or named BytesIO objects when kept in memory
+    return str(src) if isinstance(src, Path) else f"{src.name} (in memory)"
+
+@contextlib.contextmanager
+def replace_atomically(dest):
+    # Yields a sibling temp path (str) to write; on success it is renamed over dest in one step, so an
+    # ejected card never holds a half-written file and no separate unlink of the old one is needed
+    tmp_dest = os.fspath(dest) + ".tmp"
+    try:
+        yield tmp_dest
+        os.replace(tmp_dest, dest)
+    except BaseException:
+        try:
+            os.unlink(tmp_dest)
+        except OSError:
+            pass
+        raise
+
+def merge_file(src: str, dst: str, overwrite: bool):
+    if overwrite:
+        with replace_atomically(dst) as tmp_dst:
+            copy_file(src, tmp_dst)
+    else:
+        copy_file(src, dst)
+
+def merge_directories(src: Path, dst: Path, overwrite: bool, workers: int=1):
+    # Directories are made during the walk; file copies are independent and
+    # latency-bound on SD cards, so workers > 1 overlaps them in a thread pool
+    dst.mkdir(parents=True, exist_ok=True)
+    prefix = len(os.path.join(str(src), ""))
+    # Plain strings per entry: no Path object per file on trees of hundreds of entries
+    dst_str = str(dst)
+    pending = []
+    for e in walk_scandir(src):
+        d = os.path.join(dst_str, e.path[prefix:])
+        if e.is_dir(follow_symlinks=False):
+            # The walk yields each directory before its contents, so the parent always exists
+            try:
+                os.mkdir(d)
+            except FileExistsError:
+                pass
+            continue
+        if not overwrite and os.path.lexists(d):
+            continue
+        pending.append((e.path, d))
+    if workers <= 1 or len(pending) <= 1:
+        for s_path, d in pending:
+            merge_file(s_path, d, overwrite)
+        return
+    with ThreadPoolExecutor(max_workers=min(workers, len(pending))) as pool:
+        # list() re-raises the first copy error
+        list(pool.map(lambda p: merge_file(p[0], p[1], overwrite), pending))
+
+def zip_copy_member(z, info, dest):
+    # Inflate one zip member straight into dest (atomically replacing it), never through a temp dir
+    with replace_atomically(dest) as tmp_dest:
+        with z.open(info) as src, open(tmp_dest, "wb", buffering=SD_BUFSIZE) as dst_f:
+            preallocate(dst_f.fileno(), info.file_size)
+            shutil.copyfileobj(src, dst_f, length=SD_BUFSIZE)
+            settle(dst_f)
+
+def zip_merge_into(zip_path: Path, dst_root: Path, strip_prefix: str="swiss/", overwrite: bool=True) -> int:
+    # Stream members under strip_prefix straight into dst_root, skipping the temp extract + merge pass
+    # zip_path may also be a file object (an in-memory payload from extract_tar_members)
+    written = 0
+    import zipfile
+    with zipfile.ZipFile(zip_path, "r") as z:
+        for info in z.infolist():
+            name = info.filename.replace("\\","/")
+            if info.is_dir() or not name.startswith(strip_prefix):
+                continue
+            parts = [part for part in name[len(strip_prefix):].split("/") if part not in ("", ".", "..")]
+            if not parts:
+                continue
+            d = dst_root.joinpath(*parts)
             if d.exists() and not overwrite:
                 continue
-            shutil.copy2(s, d)
+            d.parent.mkdir(parents=True, exist_ok=True)
+            zip_copy_member(z, info, d)
+            written += 1
+    return written
+
+def zip_locate(names: list, name: str, is_dir: bool=False) -> str|None:
+    # Shallowest zip member called `name`; with is_dir, the "<...>/name/" prefix of the shallowest such directory
+    best = None
+    for n in names:
+        parts = n.rstrip("/").split("/")
+        cand = None
+        if is_dir and name in (parts if n.endswith("/") else parts[:-1]):
+            cand = "/".join(parts[:parts.index(name) + 1]) + "/"
+        elif not is_dir and parts[-1] == name and not n.endswith("/"):
+            cand = n
+        if cand and (best is None or cand.count("/") < best.count("/")):
+            best = cand
+    return best
+
+def extract_gekkoboot(zip_path: Path, out: Path) -> tuple:
+    # Returns (ipl.dol path, swiss/ dir) inflated from the GEKKOBOOT EXTRACT_TO_ROOT.zip
+    out.mkdir(parents=True, exist_ok=True)
+    import zipfile
+    with zipfile.ZipFile(zip_path, "r") as z:
+        names = z.namelist()
+        ipl_name = zip_locate(names, "ipl.dol")
+        swiss_prefix = zip_locate(names, "swiss", is_dir=True)
+        if not ipl_name or not swiss_prefix:
+            raise SystemExit("ERROR: GEKKOBOOT payload missing ipl.dol or swiss/ directory.")
+        # Only inflate what gets installed
+        z.extractall(out, members=[ipl_name] + [n for n in names if n.startswith(swiss_prefix)])
+    return out / ipl_name, out / swiss_prefix
+
+def install_gcloader_iso(zip_path, dest: Path) -> Path:
+    # boot.iso is streamed from the zip onto the SD card: no extracted copy in the temp dir
+    import zipfile
+    with zipfile.ZipFile(zip_path, "r") as z:
+        boot_name = zip_locate(z.namelist(), "boot.iso")
+        if not boot_name:
+            raise SystemExit("ERROR: GCLoader EXTRACT_TO_ROOT.zip did not contain boot.iso")
+        zip_copy_member(z, z.getinfo(boot_name), dest)
+    return dest
+
+def run_parallel(tasks: dict, jobs: int) -> dict:
+    # tasks: {key: (fn, args)}, each working on its own payload. Threads rather than processes:
+    # zlib releases the GIL while inflating, and nothing is spawned or pickled.
+    # Workers are capped by the task count and the CPU count; jobs <= 1 runs everything inline.
+    workers = min(jobs, len(tasks), os.cpu_count() or 1)
+    if workers <= 1:
+        return {k: fn(*a) for k, (fn, a) in tasks.items()}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futs = {k: pool.submit(fn, *a) for k, (fn, a) in tasks.items()}
+        return {k: f.result() for k, f in futs.items()}
+
+@functools.lru_cache(maxsize=None)
+def fatattr_path() -> str|None:
+    # Resolved once, like xz_path(): the availability check and every hide batch share the same PATH lookup
+    return shutil.which("fatattr")
 
 def fatattr_available() -> bool:
-    from shutil import which
-    return which("fatattr") is not None
+    return fatattr_path() is not None
 
-def hide_matching(sd_root: Path):
-    patterns = ["*.dol", "*.ini", "*.cli", "GBI", "MCBACKUP", "swiss"]
-    for pattern in patterns:
-        for p in sd_root.rglob(pattern):
-            try:
-                subprocess.run(["fatattr","+h",str(p)], check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-            except Exception:
-                # Non-critical: skip failures silently as requested
-                pass
+def arg_chunks(args: list, reserve: int=0):
+    # Split args into runs whose argv size (strings + pointers) stays well under ARG_MAX,
+    # leaving half of it for the environment and the command itself
+    try:
+        budget = os.sysconf("SC_ARG_MAX") // 2 - reserve
+    except (AttributeError, ValueError, OSError):
+        budget = 65536 - reserve
+    run, size = [], 0
+    for a in args:
+        need = len(os.fsencode(a)) + 1 + 8
+        if run and size + need > budget:
+            yield run
+            run, size = [], 0
+        run.append(a)
+        size += need
+    if run:
+        yield run
+
+def hide_matching(sd_root: Path, dry_run: bool=False):
+    # *.dol, *.ini, *.cli, GBI, MCBACKUP, swiss -- classified in one walk instead of one rglob per pattern
+    import subprocess, shlex
+    exact = {"GBI", "MCBACKUP", "swiss"}
+    suffixes = {".dol", ".ini", ".cli"}
+    paths = [e.path for e in walk_scandir(sd_root) if e.name in exact or os.path.splitext(e.name)[1].lower() in suffixes]
+    # fatattr takes many operands: one exec per ARG_MAX-sized chunk instead of per file
+    cmd = [fatattr_path() or "fatattr", "+h"]
+    for run in arg_chunks(paths, reserve=sum(len(c) + 9 for c in cmd)):
+        if dry_run:
+            log(f"(dry-run) would run: {shlex.join(cmd + run)}")
+            continue
+        try:
+            subprocess.run(cmd + run, check=False, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        except Exception:
+            # Non-critical: skip failures silently as requested
+            pass
+
+@functools.lru_cache(maxsize=None)
+def get_cubeboot_release():
+    return cached_get_json(f"{GITHUB_API}/repos/{CUBEBOOT_REPO}/releases/latest")
+
+@functools.lru_cache(maxsize=None)
+def get_cubiboot_release():
+    return cached_get_json(f"{GITHUB_API}/repos/{CUBIBOOT_REPO}/releases/latest")
 
-def fetch_cubeboot_asset(temp_dir: Path, name_exact: str, ext: str=".dol") -> Path:
-    rel = http_get_json(f"{GITHUB_API}/repos/{CUBEBOOT_REPO}/releases/latest")
+def download_asset_from_release(rel: dict, name_exact: str, ext: str, temp_dir: Path) -> Path:
     assets = rel.get("assets") or []
     asset = next((a for a in assets if str(a.get("name","")).lower() == name_exact.lower()), None)
     if not asset:
         asset = next((a for a in assets if str(a.get("name","")).lower().endswith(ext)), None)
     if not asset:
-        raise RuntimeError(f"Could not find {name_exact} in {CUBEBOOT_REPO} latest release.")
+        raise RuntimeError(f"Could not find {name_exact} in release {rel.get('tag_name') or '(unknown)'}.")
     url = asset.get("browser_download_url")
     dest = Path(temp_dir) / name_exact
     download(url, dest)
     return dest
 
-def fetch_cubiboot_asset(temp_dir: Path, name_exact: str="cubiboot.dol") -> Path:
-    rel = http_get_json(f"{GITHUB_API}/repos/{CUBIBOOT_REPO}/releases/latest")
-    assets = rel.get("assets") or []
-    asset = next((a for a in assets if str(a.get("name","")).lower() == name_exact.lower()), None)
-    if not asset:
-        asset = next((a for a in assets if str(a.get("name","")).lower().endswith(".dol")), None)
-    if not asset:
-        raise RuntimeError(f"Could not find {name_exact} in {CUBIBOOT_REPO} latest release.")
-    url = asset.get("browser_download_url")
-    dest = Path(temp_dir) / name_exact
-    download(url, dest)
-    return dest
+def ram_temp_dir(min_free: int=512 << 20) -> str|None:
+    # Downloads and payload extracts land in tmpfs when it has room, so the SD card (or a slow
+    # disk holding $TMPDIR) is only ever written with the final files; None keeps tempfile's default
+    shm = "/dev/shm"
+    try:
+        if os.path.isdir(shm) and os.access(shm, os.W_OK) and shutil.disk_usage(shm).free > min_free:
+            return shm
+    except OSError:
+        pass
+    return None
 
 def main():
     ap = argparse.ArgumentParser(
@@ -162,6 +740,12 @@ def main():
     ap.add_argument("--force", action="store_true", help="Overwrite existing files")
     ap.add_argument("--hide-files", action="store_true", help="Set FAT hidden attribute on *.dol, *.ini, *.cli, GBI, MCBACKUP, swiss using 'fatattr'")
     ap.add_argument("--verbose", action="store_true", help="More logging")
+    ap.add_argument("--jobs", type=int, default=min(4, os.cpu_count() or 1),
+                    help="Threads inflating the zip payloads in parallel (default: %(default)s; 1 disables)")
+    ap.add_argument("--parallel-copies", type=int, default=min(8, os.cpu_count() or 1),
+                    help="Threads copying files when merging a directory onto the SD card (default: %(default)s; 1 disables)")
+    ap.add_argument("--cache-downloads", action="store_true",
+                    help="Keep the Swiss archive and extracted payloads under ~/.cache/swiss-gc-fetcher/dl/<tag>/ and reuse them on later runs")
     ap.add_argument("--cubeboot", action="store_true",
                     help="Also install OffBroadway/cubeboot (picoboot only): cubeboot.dol->/ipl.dol, Swiss->/boot.dol (+cubeboot.ini). Ignored for picoloader/gcloader.")
     ap.add_argument("--cubiboot", action="store_true",
@@ -176,87 +760,149 @@ def main():
         else:
             sd_root.mkdir(parents=True, exist_ok=True)
 
-    with tempfile.TemporaryDirectory() as td:
+    if args.device == "picoboot" and args.cubeboot and args.cubiboot:
+        raise SystemExit("ERROR: --cubeboot and --cubiboot are mutually exclusive.")
+
+    # Executor is inside the temp dir context so pending downloads finish before cleanup
+    with tempfile.TemporaryDirectory(prefix="swiss_fetch_", dir=ram_temp_dir()) as td, ThreadPoolExecutor(max_workers=4) as ex:
         tmp = Path(td)
 
+        # Start the cubeboot/cubiboot release lookups and downloads first: they overlap both the
+        # Swiss release lookup below and the Swiss download
+        cb_dol_fut = cb_ini_fut = cbi_fut = None
+        if not args.dry_run and args.device == "picoboot" and args.cubeboot:
+            cb_rel_fut = ex.submit(get_cubeboot_release)
+            cb_dol_fut = ex.submit(lambda: download_asset_from_release(cb_rel_fut.result(), "cubeboot.dol", ".dol", tmp))
+            if not (sd_root / "cubeboot.ini").exists():
+                cb_ini_fut = ex.submit(lambda: download_asset_from_release(cb_rel_fut.result(), "cubeboot.ini", ".ini", tmp))
+        elif not args.dry_run and args.device in ("picoboot", "picoloader") and args.cubiboot:
+            cbi_fut = ex.submit(lambda: download_asset_from_release(get_cubiboot_release(), "cubiboot.dol", ".dol", tmp))
+
         # Fetch Swiss asset
         rel, asset = choose_release_asset(args.tag, args.previous_release)
         tag = (rel.get("tag_name") or "").strip()
 
+        # --cache-downloads keeps archive + extracted payloads per tag so re-runs skip both steps
+        work = tmp
+        if args.cache_downloads:
+            work = CACHE_DIR / "dl" / (tag or Path(asset.get("name")).stem).replace(os.sep, "_")
+
         asset_url = asset.get("browser_download_url")
-        asset_path = tmp / asset.get("name")
-        log(f"Downloading Swiss asset: {asset_url}")
-        if not args.dry_run:
-            download(asset_url, asset_path)
+        asset_path = work / asset.get("name")
+        # Without --cache-downloads there is no reason to keep a .tar.xz on disk: it is extracted straight from the response
+        stream_asset = not args.cache_downloads and asset_path.name.lower().endswith((".tar.xz", ".txz"))
+        swiss_fut = None
+        if args.cache_downloads and asset_path.exists() and asset_path.stat().st_size == asset.get("size"):
+            log(f"Using cached Swiss asset: {asset_path}")
+        elif stream_asset:
+            log(f"Streaming Swiss asset: {asset_url}")
+        else:
+            log(f"Downloading Swiss asset: {asset_url}")
+            if not args.dry_run:
+                swiss_fut = ex.submit(download, asset_url, asset_path, args.verbose)
 
-        extract_root = tmp / "extract"
+        extract_root = work / "extract"
+        if swiss_fut:
+            swiss_fut.result()
+            # A fresh archive (re-uploaded asset or a truncated earlier download) invalidates any cached extract
+            shutil.rmtree(extract_root, ignore_errors=True)
+
+        # Extraction is device-specific (payload_wanted), so the sentinel is too
+        extract_done = extract_root / f".done-{args.device}"
+        # {member name: Path or BytesIO} from this run's extraction; None (cached or .7z extract) means walk the tree
+        members = None
         if args.dry_run:
             log(f"(dry-run) would extract to {extract_root}")
+        elif args.cache_downloads and extract_done.exists():
+            log(f"Using cached extract: {extract_root}")
+        elif stream_asset:
+            # Nothing outlives the run, so the few wanted members (DOLs and payload zips) stay in memory:
+            # extract_root is never created and each byte is written to disk once, on the SD card
+            members = stream_extract_tar_xz(asset_url, extract_root, wanted=functools.partial(payload_wanted, device=args.device),
+                                            in_memory=True)
         else:
-            extract_archive(asset_path, extract_root)
+            members = extract_archive(asset_path, extract_root, wanted=functools.partial(payload_wanted, device=args.device))
+            if args.cache_downloads:
+                extract_done.touch()
 
         # Detect top-level swiss_r<rev> directory and numeric rev
         rev_dir_name = None
-        if extract_root.exists():
-            for child in extract_root.iterdir():
+        if members:
+            tops = {n.replace("\\", "/").lstrip("./").split("/", 1)[0] for n in members}
+            rev_dir_name = next((t for t in sorted(tops) if t.lower().startswith('swiss_r')), None)
+        elif extract_root.exists():
+            for child in os.scandir(extract_root):
                 name = child.name
                 if child.is_dir() and name.lower().startswith('swiss_r'):
                     rev_dir_name = name  # e.g., 'swiss_r1957'
                     break
         rev = None
         if not rev_dir_name:
-            m = _re.search(r'r(\d+)', tag)
+            m = RE_TAG_REV.search(tag)
             if m:
                 rev = m.group(1)
                 rev_dir_name = f"swiss_r{rev}"
         else:
-            m = _re.search(r'swiss_r(\d+)', rev_dir_name, _re.IGNORECASE)
+            # The name is known to start with swiss_r, so an anchored match is enough
+            m = RE_DIR_REV.match(rev_dir_name)
             if m:
                 rev = m.group(1)
         if not rev or not rev_dir_name:
             raise SystemExit("ERROR: could not determine Swiss revision from extracted asset or tag")
 
-        # Common: always refresh Apploader (remove destination img first)
+        # Every payload is resolved up front (from the extracted member names, or one walk); the branches below only dereference it
+        manifest = build_manifest(extract_root, rev, members)
         apploader_zip_rel = f"{rev_dir_name}/Apploader/EXTRACT_TO_ROOT.zip"
+        gcl_zip_rel = f"{rev_dir_name}/GCLoader/EXTRACT_TO_ROOT.zip"
+        ap_zip = gkb_zip = gcl_zip = None
+        if not args.dry_run:
+            ap_zip = manifest["apploader_zip"]
+            if not ap_zip:
+                raise SystemExit(f"ERROR: could not find {apploader_zip_rel} inside extracted asset")
+        if args.device == "picoloader":
+            gkb_zip = manifest["gekkoboot_zip"]
+            if not args.dry_run and not gkb_zip:
+                raise SystemExit("ERROR: Could not locate GEKKOBOOT EXTRACT_TO_ROOT.zip under PicoLoader.")
+        elif args.device == "gcloader" and not args.dry_run:
+            gcl_zip = manifest["gcloader_zip"]
+            if not gcl_zip:
+                raise SystemExit(f"ERROR: could not find {gcl_zip_rel} inside extracted asset")
+            # boot.iso is written alongside the Apploader merge, so refuse before anything is touched
+            if (sd_root / "boot.iso").exists() and not args.force:
+                raise SystemExit(f"ERROR: {sd_root / 'boot.iso'} exists. Use --force to overwrite.")
+
+        # Common: always refresh Apploader (each file replaced atomically); the device payload is
+        # inflated alongside it on a worker thread when --jobs allows
+        payloads = {}
         if args.dry_run:
             log(f"(dry-run) would extract {apploader_zip_rel} and merge into {sd_root / 'swiss'}")
         else:
-            ap_zip = find_member(extract_root, apploader_zip_rel)
-            if not ap_zip:
-                raise SystemExit(f"ERROR: could not find {apploader_zip_rel} inside extracted asset")
-            log(f"Extracting Apploader payload: {ap_zip}")
-            ap_out = tmp / "apploader"
-            ap_out.mkdir(parents=True, exist_ok=True)
-            with zipfile.ZipFile(ap_zip, "r") as z:
-                z.extractall(ap_out)
-            src_swiss = ap_out / "swiss"
             dst_swiss = sd_root / "swiss"
-            dst_apploader = dst_swiss / "patches" / "apploader.img"
-            if dst_apploader.exists():
-                try:
-                    log(f"Removing existing apploader: {dst_apploader}")
-                    dst_apploader.unlink()
-                except Exception as e:
-                    log(f"WARNING: failed to remove {dst_apploader}: {e}")
-            log(f"Merging {src_swiss} -> {dst_swiss} (overwrite apploader)")
-            merge_directories(src_swiss, dst_swiss, overwrite=True)
+            log(f"Merging Apploader payload {payload_label(ap_zip)} -> {dst_swiss} (overwrite apploader)")
+            tasks = {"apploader": (zip_merge_into, (ap_zip, dst_swiss, "swiss/", True))}
+            if gkb_zip:
+                log(f"Extracting Picoloader GEKKOBOOT payload: {payload_label(gkb_zip)}")
+                tasks["gekkoboot"] = (extract_gekkoboot, (gkb_zip, tmp / "picoloader"))
+            if gcl_zip:
+                boot_iso_dest = sd_root / "boot.iso"
+                log(f"Installing GCLoader boot.iso: {payload_label(gcl_zip)} -> {boot_iso_dest}")
+                tasks["gcloader"] = (install_gcloader_iso, (gcl_zip, boot_iso_dest))
+            payloads = run_parallel(tasks, args.jobs)
 
         # Swiss DOL path
-        dol_rel = f"{rev_dir_name}/DOL/swiss_r{rev}.dol"
-        dol_file = find_member(extract_root, dol_rel)
+        dol_file = manifest["dol"]
         if not dol_file:
-            raise SystemExit(f"ERROR: could not find {dol_rel} inside extracted asset")
+            raise SystemExit(f"ERROR: could not find {rev_dir_name}/DOL/swiss_r{rev}.dol inside extracted asset")
+        # A cached extract is reused by later runs, so only a temp-dir DOL may be moved onto the card
+        dol_owned = not args.cache_downloads
 
         # Per-device flow
         if args.device == "picoboot":
-            if args.cubeboot and args.cubiboot:
-                raise SystemExit("ERROR: --cubeboot and --cubiboot are mutually exclusive.")
-
             if args.cubeboot:
                 if args.dry_run:
                     log("(dry-run) would fetch OffBroadway/cubeboot cubeboot.dol (+ini)")
                 else:
-                    cb_path = fetch_cubeboot_asset(tmp, "cubeboot.dol", ".dol")
+                    cb_path = cb_dol_fut.result()
                     ipl_dest = sd_root / "ipl.dol"
                     if ipl_dest.exists() and not args.force:
                         raise SystemExit(f"ERROR: {ipl_dest} exists. Use --force to overwrite.")
@@ -264,22 +910,22 @@ def main():
                     if boot_dol_dest.exists() and not args.force:
                         raise SystemExit(f"ERROR: {boot_dol_dest} exists. Use --force to overwrite.")
                     log(f"Installing cubeboot -> {ipl_dest}")
-                    shutil.copy2(cb_path, ipl_dest)
+                    install_file(cb_path, ipl_dest, owned=True)
                     log(f"Installing Swiss DOL -> {boot_dol_dest}")
-                    shutil.copy2(dol_file, boot_dol_dest)
+                    install_file(dol_file, boot_dol_dest, owned=dol_owned)
                     ini_dest = sd_root / "cubeboot.ini"
-                    if not ini_dest.exists():
+                    if cb_ini_fut:
                         try:
-                            ini_path = fetch_cubeboot_asset(tmp, "cubeboot.ini", ".ini")
+                            ini_path = cb_ini_fut.result()
                             log(f"Installing cubeboot.ini -> {ini_dest}")
-                            shutil.copy2(ini_path, ini_dest)
+                            install_file(ini_path, ini_dest, owned=True)
                         except Exception as e:
                             log(f"WARNING: could not fetch cubeboot.ini: {e}")
             elif args.cubiboot:
                 if args.dry_run:
                     log("(dry-run) would fetch makeo/cubiboot cubiboot.dol")
                 else:
-                    cbi_path = fetch_cubiboot_asset(tmp)
+                    cbi_path = cbi_fut.result()
                     ipl_dest = sd_root / "ipl.dol"
                     if ipl_dest.exists() and not args.force:
                         raise SystemExit(f"ERROR: {ipl_dest} exists. Use --force to overwrite.")
@@ -287,9 +933,9 @@ def main():
                     if sgc_dest.exists() and not args.force:
                         raise SystemExit(f"ERROR: {sgc_dest} exists. Use --force to overwrite.")
                     log(f"Installing cubiboot -> {ipl_dest}")
-                    shutil.copy2(cbi_path, ipl_dest)
+                    install_file(cbi_path, ipl_dest, owned=True)
                     log(f"Installing Swiss DOL -> {sgc_dest}")
-                    shutil.copy2(dol_file, sgc_dest)
+                    install_file(dol_file, sgc_dest, owned=dol_owned)
             else:
                 # ensure swiss-gc.dol is removed when not using cubiboot
                 sgc = sd_root / "swiss-gc.dol"
@@ -305,39 +951,15 @@ def main():
                 if args.dry_run:
                     log(f"(dry-run) would install IPL DOL -> {ipl_dest}")
                 else:
-                    shutil.copy2(dol_file, ipl_dest)
+                    install_file(dol_file, ipl_dest, owned=dol_owned)
 
         elif args.device == "picoloader":
             if args.cubeboot:
                 log("NOTICE: --cubeboot is ignored for --device picoloader (use --cubiboot instead).")
-            # Find the GEKKOBOOT EXTRACT_TO_ROOT.zip under */PicoLoader/*/gekkoboot/
-            gkb_zip = None
-            for cand in extract_root.rglob("*"):
-                if cand.is_dir() and "pico" in cand.name.lower() and "loader" in cand.name.lower():
-                    for zc in cand.rglob("gekkoboot"):
-                        if zc.is_dir():
-                            for zf in zc.glob("*.zip"):
-                                if "extract_to_root" in zf.name.lower():
-                                    gkb_zip = zf
-                                    break
-                        if gkb_zip:
-                            break
-                if gkb_zip:
-                    break
             if args.dry_run:
                 log(f"(dry-run) would extract GEKKOBOOT zip: {gkb_zip or 'NOT FOUND'}")
             else:
-                if not gkb_zip or not gkb_zip.exists():
-                    raise SystemExit("ERROR: Could not locate GEKKOBOOT EXTRACT_TO_ROOT.zip under PicoLoader.")
-                log(f"Extracting Picoloader GEKKOBOOT payload: {gkb_zip}")
-                out = tmp / "picoloader"
-                out.mkdir(parents=True, exist_ok=True)
-                with zipfile.ZipFile(gkb_zip, "r") as z:
-                    z.extractall(out)
-                ipl_src = next((p for p in out.rglob("ipl.dol") if p.is_file()), None)
-                swiss_src = next((p for p in out.rglob("swiss") if p.is_dir()), None)
-                if not ipl_src or not swiss_src:
-                    raise SystemExit("ERROR: GEKKOBOOT payload missing ipl.dol or swiss/ directory.")
+                ipl_src, swiss_src = payloads["gekkoboot"]
                 # delete any existing boot.dol or ipl.dol as per convention when overwriting
                 for f in (sd_root / "boot.dol", sd_root / "ipl.dol"):
                     if f.exists():
@@ -346,13 +968,13 @@ def main():
                         log(f"Removing existing file: {f}")
                         f.unlink()
                 log(f"Installing Picoloader IPL: {ipl_src} -> {sd_root / 'ipl.dol'}")
-                shutil.copy2(ipl_src, sd_root / "ipl.dol")
+                install_file(ipl_src, sd_root / "ipl.dol", owned=True)
                 log(f"Merging {swiss_src} -> {sd_root / 'swiss'}")
-                merge_directories(swiss_src, sd_root / "swiss", overwrite=True)
+                merge_directories(swiss_src, sd_root / "swiss", overwrite=True, workers=args.parallel_copies)
 
             # cubiboot handling (after GEKKOBOOT merge)
             if args.cubiboot and not args.dry_run:
-                cbi_path = fetch_cubiboot_asset(tmp)
+                cbi_path = cbi_fut.result()
                 ipl_dest = sd_root / "ipl.dol"
                 if ipl_dest.exists() and not args.force:
                     raise SystemExit(f"ERROR: {ipl_dest} exists. Use --force to overwrite.")
@@ -360,9 +982,9 @@ def main():
                 if sgc_dest.exists() and not args.force:
                     raise SystemExit(f"ERROR: {sgc_dest} exists. Use --force to overwrite.")
                 log(f"Installing cubiboot -> {ipl_dest}")
-                shutil.copy2(cbi_path, ipl_dest)
+                install_file(cbi_path, ipl_dest, owned=True)
                 log(f"Installing Swiss DOL -> {sgc_dest}")
-                shutil.copy2(dol_file, sgc_dest)
+                install_file(dol_file, sgc_dest, owned=dol_owned)
             elif not args.cubiboot and not args.dry_run:
                 # ensure swiss-gc.dol is removed when not using cubiboot
                 sgc = sd_root / "swiss-gc.dol"
@@ -378,32 +1000,16 @@ def main():
                 log("NOTICE: --cubeboot is ignored for --device gcloader (no DOL boot at SD root).")
             if args.cubiboot:
                 log("NOTICE: --cubiboot is ignored for --device gcloader (no DOL boot at SD root).")
-            gcl_zip_rel = f"{rev_dir_name}/GCLoader/EXTRACT_TO_ROOT.zip"
             if args.dry_run:
                 log(f"(dry-run) would extract {gcl_zip_rel} and install /boot.iso")
-            else:
-                gcl_zip = find_member(extract_root, gcl_zip_rel)
-                if not gcl_zip:
-                    raise SystemExit(f"ERROR: could not find {gcl_zip_rel} inside extracted asset")
-                out = tmp / "gcloader"
-                out.mkdir(parents=True, exist_ok=True)
-                with zipfile.ZipFile(gcl_zip, "r") as z:
-                    z.extractall(out)
-                boot_iso = next((p for p in out.rglob("boot.iso")), None)
-                if not boot_iso:
-                    raise SystemExit("ERROR: GCLoader EXTRACT_TO_ROOT.zip did not contain boot.iso")
-                dest = sd_root / "boot.iso"
-                if dest.exists() and not args.force:
-                    raise SystemExit(f"ERROR: {dest} exists. Use --force to overwrite.")
-                log(f"Installing GCLoader boot.iso: {boot_iso} -> {dest}")
-                shutil.copy2(boot_iso, dest)
+            # Otherwise boot.iso was already streamed onto the card next to the Apploader merge
 
         # Hide files/folders if requested
         if args.hide_files:
             if fatattr_available():
                 log("NOTICE: --hide-files requested: 'fatattr' detected in PATH.")
-                if not args.dry_run:
-                    hide_matching(sd_root)
+                if sd_root.exists():
+                    hide_matching(sd_root, dry_run=args.dry_run)
             else:
                 log("NOTICE: --hide-files requested but 'fatattr' not found in PATH; skipping hide step.")
 
@@ -411,6 +1017,9 @@ def main():
     return 0
 
 if __name__ == "__main__":
+    import warnings
+    # Suppress non-critical noise (user requested)
+    warnings.filterwarnings("ignore", category=DeprecationWarning)
     try:
         sys.exit(main())
     except KeyboardInterrupt: